@@ -37,12 +37,21 @@ import sys
 import re
 from typing import List, Optional
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from openpyxl import load_workbook
 
 
 NUMERIC_RE = re.compile(r'^[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?$')
+# Cheap pre-check for ASCII numeric-looking strings: must start with a sign, dot or
+# digit and contain nothing but [+-.0-9eE]. Over that alphabet Decimal() accepts
+# exactly what NUMERIC_RE does, so it does the final validation. Non-ASCII strings
+# (e.g. full-width or Arabic-Indic digits, which \d matches) still use NUMERIC_RE.
+NUMERIC_LEAD = frozenset("+-.0123456789")
+NUMERIC_STRIP = str.maketrans("", "", "+-.0123456789eE")
+DP5 = Decimal("0.00001")
 
 
+@lru_cache(maxsize=200_000, typed=True)
 def as_decimal_if_numeric(value) -> Optional[Decimal]:
     """Return a Decimal if the value is numeric or numeric-like; otherwise None."""
     if value is None:
@@ -57,7 +66,11 @@ def as_decimal_if_numeric(value) -> Optional[Decimal]:
         s = value.strip().replace(',', '')  # drop thousands separators
         if s == "":
             return None
-        if NUMERIC_RE.match(s):
+        if s.isascii():
+            is_numeric = s[0] in NUMERIC_LEAD and not s.translate(NUMERIC_STRIP)
+        else:
+            is_numeric = NUMERIC_RE.match(s) is not None
+        if is_numeric:
             try:
                 return Decimal(s)
             except Exception:
@@ -65,6 +78,9 @@ def as_decimal_if_numeric(value) -> Optional[Decimal]:
     return None
 
 
+# Cell values repeat heavily (codes, flags, zeros). typed=True keeps True/1/1.0
+# apart: they hash equal but do not normalize the same.
+@lru_cache(maxsize=200_000, typed=True)
 def normalize(value) -> str:
     """
     Normalize a cell to a canonical comparable string.
@@ -74,21 +90,30 @@ def normalize(value) -> str:
     - Else: trimmed + lowercased string.
     - None -> empty string.
     """
+    # Fast paths for the numeric types openpyxl yields. Output is identical to the
+    # Decimal route; floats whose repr needs actual rounding still take that route.
+    if type(value) is int:
+        return f"{value}.00000" if value else "0.00000"
+    if type(value) is float:
+        if value == 0:
+            return "0.00000"
+        s = repr(value)
+        dot = s.find(".")
+        if dot != -1 and "e" not in s and len(s) - dot <= 6:
+            return s.ljust(dot + 6, "0")
     d = as_decimal_if_numeric(value)
     if d is not None:
-        q = d.quantize(Decimal("0.00001"), rounding=ROUND_HALF_UP)
+        q = d.quantize(DP5, rounding=ROUND_HALF_UP)
         if q == 0:
             return "0.00000"
-        return f"{q}"  # Decimal str keeps the quantized places (e.g., 1.23000)
+        return str(q)  # Decimal str keeps the quantized places (e.g., 1.23000)
     if value is None:
         return ""
+    if type(value) is str:
+        return value.strip().lower()
     return str(value).strip().lower()
 
 
-def read_row(ws, row_index: int, num_cols: int) -> List[str]:
-    return [normalize(ws.cell(row=row_index, column=c).value) for c in range(1, num_cols + 1)]
-
-
 def is_empty_row(values: List[str]) -> bool:
     return all(v == "" for v in values)
 
@@ -104,6 +129,9 @@ def main():
     parser.add_argument("--auto-start", type=int, default=2)
     parser.add_argument("--offset", type=int, default=0, help="Zero-based additional offset from the start rows")
     args = parser.parse_args()
+    # iter_rows treats max_col=0 as "no limit", which would compare whole rows.
+    if args.num_cols < 1:
+        parser.error("--num-cols must be at least 1")
 
     try:
         wb_m = load_workbook(filename=args.manual_path, data_only=True, read_only=True)
@@ -121,6 +149,10 @@ def main():
 
     ws_m = wb_m[args.manual_sheet]
     ws_a = wb_a[args.auto_sheet]
+    # iter_rows stops at the sheet's stored <dimension>, which some exporters get
+    # wrong; drop it so streaming runs to the real last row in the sheet XML.
+    ws_m.reset_dimensions()
+    ws_a.reset_dimensions()
 
     m_row = args.manual_start + args.offset
     a_row = args.auto_start + args.offset
@@ -131,20 +163,28 @@ def main():
           f"(manual row {m_row} vs auto row {a_row}) over {args.num_cols} columns.")
     print("Note: Numeric values are rounded to 5 decimal places (HALF_UP) before comparison.")
 
-    while True:
-        m_vals = read_row(ws_m, m_row, args.num_cols)
-        a_vals = read_row(ws_a, a_row, args.num_cols)
+    # Stream both sheets once; ws.cell() re-scans the sheet XML in read-only mode.
+    # The manual stream drives the loop and ends at its last real row; rows past
+    # the end of the auto sheet read as all-empty.
+    empty_row = (None,) * args.num_cols
+    m_rows = ws_m.iter_rows(min_row=m_row, max_row=None, min_col=1, max_col=args.num_cols, values_only=True)
+    a_rows = ws_a.iter_rows(min_row=a_row, max_row=None, min_col=1, max_col=args.num_cols, values_only=True)
+
+    for m_raw in m_rows:
+        m_vals = [normalize(v) for v in m_raw]
 
-        # End condition: if either side's N cells are all empty, stop cleanly.
+        # End condition: if the manual side's N cells are all empty, stop cleanly
+        # without reading or normalizing the auto row.
         if is_empty_row(m_vals):
-            print("Success! Reached end-of-data in manual sheet.")
-            print(f"Compared {compared_pairs} row pair(s) with no mismatches.")
-            print(f"Final offset reached: {current_offset}")
-            sys.exit(0)
-
-        # Compare cell-by-cell.
-        mismatches = [(idx + 1, mv, av) for idx, (mv, av) in enumerate(zip(m_vals, a_vals)) if mv != av]
-        if mismatches:
+            break
+
+        a_raw = next(a_rows, empty_row)
+
+        # Compare cell-by-cell, stopping at the first difference. Only a mismatching
+        # row gets fully normalized, to list every differing column in the report.
+        if any(mv != normalize(av) for mv, av in zip(m_vals, a_raw)):
+            a_vals = [normalize(v) for v in a_raw]
+            mismatches = [(idx + 1, mv, av) for idx, (mv, av) in enumerate(zip(m_vals, a_vals)) if mv != av]
             print("Mismatch detected!")
             print(f"Offset: {current_offset}")
             print(f"Manual Excel row: {m_row} | Auto Excel row: {a_row}")
@@ -165,6 +205,11 @@ def main():
         if compared_pairs % 10 == 0:
             print(f"...progress: {compared_pairs} pairs matched (current offset {current_offset})")
 
+    print("Success! Reached end-of-data in manual sheet.")
+    print(f"Compared {compared_pairs} row pair(s) with no mismatches.")
+    print(f"Final offset reached: {current_offset}")
+    sys.exit(0)
+
 
 if __name__ == "__main__":
     main()
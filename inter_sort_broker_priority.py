@@ -27,7 +27,9 @@ import argparse
 from pathlib import Path
 import sys
 from typing import List
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook, load_workbook
 
 # ---- EDIT YOUR PRIORITY ORDER HERE ----
 PRIORITY = ["DHLE", "DWM", "FEDEX", "POL", "UPS"]
@@ -52,22 +54,58 @@ def sort_by_broker_priority(df: pd.DataFrame, broker_col: str) -> pd.DataFrame:
     - Priority groups appear first, in PRIORITY order.
     - Non-priority groups come after, ordered alphabetically by Broker.
     """
-    df = df.copy()
-    df["_orig_idx"] = range(len(df))
+    keys = df[broker_col].astype(str).fillna("").str.strip().to_numpy(dtype=object)
 
-    broker_vals = df[broker_col].astype(str).fillna("").str.strip()
+    # Rank each distinct Broker once: PRIORITY position first, then the rest.
+    # np.unique returns groups sorted, so non-priority ranks come out alphabetical.
+    groups, codes = np.unique(keys, return_inverse=True)
     priority_index = {b: i for i, b in enumerate(PRIORITY)}
+    group_rank = np.fromiter(
+        (priority_index.get(b, len(PRIORITY) + i) for i, b in enumerate(groups)),
+        dtype=np.int32,
+        count=len(groups),
+    )
+    rank = group_rank[codes]
 
-    df["_is_nonprio"] = (~broker_vals.isin(PRIORITY)).astype(int)
-    df["_prio_idx"] = broker_vals.map(priority_index).fillna(0).astype(int)
-    df["_broker_sort"] = broker_vals.where(df["_is_nonprio"] == 1, "")
+    # Row position as the secondary key keeps the sort stable.
+    order = np.lexsort((np.arange(len(keys)), rank))
+    return df.take(order)
 
-    df_sorted = df.sort_values(
-        by=["_is_nonprio", "_prio_idx", "_broker_sort", "_orig_idx"],
-        kind="mergesort",
-    )
 
-    return df_sorted.drop(columns=["_is_nonprio", "_prio_idx", "_broker_sort", "_orig_idx"])
+def read_sheet_rows(ws) -> tuple[list, list[list]]:
+    """
+    Read a worksheet as (header, body) with every row padded to the same width.
+    Trailing all-empty rows are dropped so they don't end up sorted into the data.
+    """
+    rows = [list(row) for row in ws.iter_rows(values_only=True)]
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    if not rows:
+        return [], []
+    width = max(len(row) for row in rows)
+    for row in rows:
+        row.extend([None] * (width - len(row)))
+    return rows[0], rows[1:]
+
+
+def unique_labels(header: list) -> list:
+    """
+    Make header labels unique for use as DataFrame columns, the way pd.read_excel
+    did: blank cells become 'Unnamed: <i>', the first 'Broker' keeps its name and
+    later ones become 'Broker.1', ...
+    """
+    seen = set()
+    out = []
+    for i, label in enumerate(header):
+        if label is None:
+            label = f"Unnamed: {i}"
+        candidate, n = label, 0
+        while candidate in seen:
+            n += 1
+            candidate = f"{label}.{n}"
+        seen.add(candidate)
+        out.append(candidate)
+    return out
 
 
 def _normalize_sheet_tokens(tokens: List[str]) -> List[str]:
@@ -157,51 +195,78 @@ def main(argv: list[str] | None = None) -> int:
         return 2
 
     try:
-        xls = pd.ExcelFile(in_path, engine="openpyxl")
+        wb_in = load_workbook(in_path, read_only=True, data_only=True)
     except Exception as e:
         print(f"ERROR: Failed to open Excel file: {e}", file=sys.stderr)
         return 3
 
-    target_sheet_names = resolve_target_sheets(args.sheets, args.sheet, xls.sheet_names)
+    target_sheet_names = resolve_target_sheets(args.sheets, args.sheet, wb_in.sheetnames)
     if not target_sheet_names:
         print("ERROR: No matching sheets found to process.", file=sys.stderr)
+        wb_in.close()
         return 4
 
     out_path = Path(args.output) if args.output else in_path.with_stem(in_path.stem + "-sorted")
 
-    out_frames: dict[str, pd.DataFrame] = {}
+    wb_out = Workbook(write_only=True)
     sorted_any = False
 
-    for name in xls.sheet_names:
-        try:
-            df = pd.read_excel(xls, sheet_name=name, engine="openpyxl")
-        except Exception as e:
-            print(f"WARNING: Failed to read sheet '{name}': {e}. Copying as-is.", file=sys.stderr)
-            out_frames[name] = pd.DataFrame()
-            continue
+    # Read-only workbooks keep the source archive open until closed, including
+    # when a sheet can't be processed.
+    try:
+        for name in wb_in.sheetnames:
+            ws_in = wb_in[name]
+            # Chartsheets have no cells (and no reset_dimensions); leave them out.
+            if not hasattr(ws_in, "iter_rows"):
+                print(f"WARNING: Failed to read sheet '{name}': not a worksheet. Leaving it out of the output.", file=sys.stderr)
+                continue
+            # iter_rows stops at the sheet's stored <dimension>, which some exporters get
+            # wrong; pd.read_excel used to reset it for us. Stream to the real last row.
+            ws_in.reset_dimensions()
+
+            # Sheets we don't sort are streamed straight across; no DataFrame needed.
+            # Rows already streamed stay written if reading fails partway.
+            if name not in target_sheet_names:
+                ws_out = wb_out.create_sheet(name)
+                try:
+                    for row in ws_in.iter_rows(values_only=True):
+                        ws_out.append(row)
+                except Exception as e:
+                    print(f"WARNING: Failed to read sheet '{name}': {e}. Output sheet may be truncated.", file=sys.stderr)
+                continue
 
-        if name in target_sheet_names:
+            try:
+                header, body = read_sheet_rows(ws_in)
+            except Exception as e:
+                print(f"WARNING: Failed to read sheet '{name}': {e}. Leaving it out of the output.", file=sys.stderr)
+                continue
+            ws_out = wb_out.create_sheet(name)
+
+            # Labels are only used to locate the Broker column; the original header
+            # row is what gets written back.
+            df = pd.DataFrame(body, columns=unique_labels(header), dtype=object)
             try:
                 broker_col = find_broker_column(df)
-                out_frames[name] = sort_by_broker_priority(df, broker_col)
+                df = sort_by_broker_priority(df, broker_col)
                 sorted_any = True
                 print(f"Sorted sheet: {name}")
             except KeyError as e:
                 print(f"WARNING: {name}: {e}. Leaving sheet unchanged.", file=sys.stderr)
-                out_frames[name] = df
-        else:
-            out_frames[name] = df
+            except Exception as e:
+                print(f"WARNING: {name}: Failed to sort: {e}. Leaving sheet unchanged.", file=sys.stderr)
+
+            if header:
+                ws_out.append(header)
+            for row in df.itertuples(index=False, name=None):
+                ws_out.append(row)
+    finally:
+        wb_in.close()
 
     if not sorted_any:
         print("WARNING: No sheets were sorted (Broker column missing or none matched). Writing workbook unchanged.", file=sys.stderr)
 
     try:
-        with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
-            for name, df in out_frames.items():
-                # If a sheet failed to read (rare), skip writing empty DataFrame to avoid confusion
-                if df is None or (isinstance(df, pd.DataFrame) and df.empty and name not in target_sheet_names):
-                    continue
-                df.to_excel(writer, sheet_name=name, index=False)
+        wb_out.save(out_path)
     except Exception as e:
         print(f"ERROR: Failed to write output Excel: {e}", file=sys.stderr)
         return 5
@@ -36,30 +36,37 @@ Exit codes:
   2  Usage/file/sheet errors (e.g., missing sheet encountered).
 
 Requires:
-  pip install openpyxl
+  pip install numpy openpyxl
 """
 import argparse
 import re
 import sys
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from itertools import islice, zip_longest
 from typing import List, Optional
 
+import numpy as np
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
 
 NUMERIC_RE = re.compile(r'^[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?$')
+# Cheap pre-check for ASCII numeric-looking strings: must start with a sign, dot or
+# digit and contain nothing but [+-.0-9eE]. Over that alphabet Decimal() accepts
+# exactly what NUMERIC_RE does, so it does the final validation. Non-ASCII strings
+# (e.g. full-width or Arabic-Indic digits, which \d matches) still use NUMERIC_RE.
+NUMERIC_LEAD = frozenset("+-.0123456789")
+NUMERIC_STRIP = str.maketrans("", "", "+-.0123456789eE")
 DP5 = Decimal("0.00001")
+CHUNK_ROWS = 1024
 
 
 def a1(col: int, row: int) -> str:
     """Convert 1-based (col, row) to A1 notation."""
-    s = ""
-    c = col
-    while c > 0:
-        c, rem = divmod(c - 1, 26)
-        s = chr(65 + rem) + s
-    return f"{s}{row}"
+    return f"{get_column_letter(col)}{row}"
 
 
+@lru_cache(maxsize=200_000, typed=True)
 def as_decimal_if_numeric(value) -> Optional[Decimal]:
     """Return a Decimal if value is numeric or numeric-like; else None."""
     if value is None:
@@ -75,7 +82,11 @@ def as_decimal_if_numeric(value) -> Optional[Decimal]:
         s = value.strip().replace(',', '')
         if not s:
             return None
-        if NUMERIC_RE.match(s):
+        if s.isascii():
+            is_numeric = s[0] in NUMERIC_LEAD and not s.translate(NUMERIC_STRIP)
+        else:
+            is_numeric = NUMERIC_RE.match(s) is not None
+        if is_numeric:
             try:
                 return Decimal(s)
             except Exception:
@@ -83,39 +94,83 @@ def as_decimal_if_numeric(value) -> Optional[Decimal]:
     return None
 
 
+# Cell values repeat heavily (codes, flags, zeros). typed=True keeps True/1/1.0
+# apart: they hash equal but do not normalize the same.
+@lru_cache(maxsize=200_000, typed=True)
 def normalize(value) -> str:
     """Normalize for comparison (5dp numeric, else trimmed lowercase)."""
+    # Fast paths for the numeric types openpyxl yields. Output is identical to the
+    # Decimal route; floats whose repr needs actual rounding still take that route.
+    if type(value) is int:
+        return f"{value}.00000" if value else "0.00000"
+    if type(value) is float:
+        if value == 0:
+            return "0.00000"
+        s = repr(value)
+        dot = s.find(".")
+        if dot != -1 and "e" not in s and len(s) - dot <= 6:
+            return s.ljust(dot + 6, "0")
     d = as_decimal_if_numeric(value)
     if d is not None:
         q = d.quantize(DP5, rounding=ROUND_HALF_UP)
         if q == 0:
             return "0.00000"
-        return f"{q:.5f}"
+        return str(q)  # quantized to 1E-5, so always plain notation with 5 places
     if value is None:
         return ""
+    if type(value) is str:
+        return value.strip().lower()
     return str(value).strip().lower()
 
 
+# Elementwise normalize() / type() over object arrays; the loops run in C.
+normalize_cells = np.frompyfunc(normalize, 1, 1)
+cell_types = np.frompyfunc(type, 1, 1)
+
+
 def compare_rect(ws_m, ws_a, sheet: str, start_row: int, start_col: int, rows: int, cols: int):
     """Compare a rectangle; return (ok, info) where ok is True if fully matched; else False with mismatch info."""
-    for r in range(start_row, start_row + rows):
-        for c in range(start_col, start_col + cols):
-            mv = ws_m.cell(row=r, column=c).value
-            av = ws_a.cell(row=r, column=c).value
-            nm = normalize(mv)
-            na = normalize(av)
-            if nm != na:
-                cell = a1(c, r)
-                return False, {
-                    "sheet": sheet,
-                    "cell": cell,
-                    "row": r,
-                    "col": c,
-                    "manual_norm": nm,
-                    "auto_norm": na,
-                    "manual_raw": mv,
-                    "auto_raw": av,
-                }
+    if rows <= 0 or cols <= 0:
+        return True, None
+    end_row = start_row + rows - 1
+    end_col = start_col + cols - 1
+    rows_m = ws_m.iter_rows(min_row=start_row, max_row=end_row, min_col=start_col, max_col=end_col, values_only=True)
+    rows_a = ws_a.iter_rows(min_row=start_row, max_row=end_row, min_col=start_col, max_col=end_col, values_only=True)
+    # Read-only sheets may end before the rectangle does; pad with empty rows.
+    empty_row = (None,) * cols
+    pairs = zip_longest(rows_m, rows_a, fillvalue=empty_row)
+
+    # Compare in row chunks so we still stop reading soon after the first mismatch.
+    chunk_start = 0
+    while True:
+        chunk = list(islice(pairs, CHUNK_ROWS))
+        if not chunk:
+            break
+        m_raw = np.array([row_m for row_m, _ in chunk], dtype=object).reshape(len(chunk), cols)
+        a_raw = np.array([row_a for _, row_a in chunk], dtype=object).reshape(len(chunk), cols)
+        # Equal raw values of the same type always normalize equally, so only the
+        # remaining cells need normalize(). The type check keeps True vs 1 apart.
+        same = (m_raw == a_raw) & (cell_types(m_raw) == cell_types(a_raw))
+        todo = np.flatnonzero(~same)
+        m_norm = normalize_cells(m_raw.ravel()[todo])
+        a_norm = normalize_cells(a_raw.ravel()[todo])
+        diff = np.flatnonzero(m_norm != a_norm)
+        if diff.size:
+            r_off, c_off = divmod(int(todo[diff[0]]), cols)
+            r = start_row + chunk_start + r_off
+            c = start_col + c_off
+            cell = a1(c, r)
+            return False, {
+                "sheet": sheet,
+                "cell": cell,
+                "row": r,
+                "col": c,
+                "manual_norm": m_norm[diff[0]],
+                "auto_norm": a_norm[diff[0]],
+                "manual_raw": m_raw[r_off, c_off],
+                "auto_raw": a_raw[r_off, c_off],
+            }
+        chunk_start += len(chunk)
     return True, None
 
 
@@ -130,8 +185,6 @@ def main():
     p.add_argument("--start-col", type=int, default=1)
     args = p.parse_args()
 
-    args.sheets = ['Non ic&die']
-
     try:
         wb_m = load_workbook(filename=args.manual_path, data_only=True, read_only=True)
         wb_a = load_workbook(filename=args.auto_path, data_only=True, read_only=True)
@@ -140,11 +193,14 @@ def main():
         sys.exit(2)
 
     matched_sheets: List[str] = []
+    # wb.sheetnames rebuilds a list on every access; look names up in sets instead.
+    manual_names = set(wb_m.sheetnames)
+    auto_names = set(wb_a.sheetnames)
 
     # Process sheets sequentially; stop upon first mismatch or first missing sheet.
     for sheet in args.sheets:
-        has_manual = sheet in wb_m.sheetnames
-        has_auto = sheet in wb_a.sheetnames
+        has_manual = sheet in manual_names
+        has_auto = sheet in auto_names
 
         if not has_manual or not has_auto:
             print("\n*** SHEET NOT FOUND ***")